@@ -10,7 +10,7 @@ from scipy.spatial.distance import cdist, pdist, squareform
 from sklearn.utils import gen_even_slices
 from sklearn.utils.validation import _num_samples
 
-from ._utils import _subdiagrams, _sample_image
+from ._utils import _subdiagrams, _subdiagrams_indices, _sample_image
 from ..externals.modules.gtda_bottleneck import bottleneck_distance
 from ..externals.modules.gtda_wasserstein import wasserstein_distance
 from ..utils.intervals import Interval
@@ -169,22 +169,34 @@ def silhouettes(diagrams, sampling, power, **kwargs):
     midpoints = (diagrams[:, :, [1]] + diagrams[:, :, [0]]) / 2.
     heights = (diagrams[:, :, [1]] - diagrams[:, :, [0]]) / 2.
     fibers = np.maximum(-np.abs(sampling - midpoints) + heights, 0)
-    fibers_weighted_sum = np.sum(weights * fibers, axis=1) / total_weights
+    # Contract over points without materializing the product of weights and
+    # fibers
+    fibers_weighted_sum = \
+        np.einsum('ijk,ij->ik', fibers, weights[:, :, 0]) / total_weights
     return fibers_weighted_sum
 
 
+def _nontrivial_points(diagrams):
+    """Remove the points on the diagonal from each diagram in a collection,
+    computing the diagonal mask once for the whole collection."""
+    is_nontrivial = diagrams[:, :, 0] != diagrams[:, :, 1]
+    return [diagram[mask] for diagram, mask in zip(diagrams, is_nontrivial)]
+
+
 def bottleneck_distances(diagrams_1, diagrams_2, delta=0.01, **kwargs):
-    return np.array([[bottleneck_distance(
-        diagram_1[diagram_1[:, 0] != diagram_1[:, 1]],
-        diagram_2[diagram_2[:, 0] != diagram_2[:, 1]],
-        delta) for diagram_2 in diagrams_2] for diagram_1 in diagrams_1])
+    diagrams_1 = _nontrivial_points(diagrams_1)
+    diagrams_2 = _nontrivial_points(diagrams_2)
+    return np.array([[bottleneck_distance(diagram_1, diagram_2, delta)
+                      for diagram_2 in diagrams_2]
+                     for diagram_1 in diagrams_1])
 
 
 def wasserstein_distances(diagrams_1, diagrams_2, p=2, delta=0.01, **kwargs):
-    return np.array([[wasserstein_distance(
-        diagram_1[diagram_1[:, 0] != diagram_1[:, 1]],
-        diagram_2[diagram_2[:, 0] != diagram_2[:, 1]],
-        p, delta,) for diagram_2 in diagrams_2] for diagram_1 in diagrams_1])
+    diagrams_1 = _nontrivial_points(diagrams_1)
+    diagrams_2 = _nontrivial_points(diagrams_2)
+    return np.array([[wasserstein_distance(diagram_1, diagram_2, p, delta)
+                      for diagram_2 in diagrams_2]
+                     for diagram_1 in diagrams_1])
 
 
 def betti_distances(
@@ -420,23 +432,40 @@ def _parallel_amplitude(X, metric, metric_params, homology_dimensions, n_jobs):
     none_dict = {dim: None for dim in homology_dimensions}
     samplings = effective_metric_params.pop("samplings", none_dict)
     step_sizes = effective_metric_params.pop("step_sizes", none_dict)
+    X, indices = _subdiagrams_indices(X, homology_dimensions)
     if metric in ["heat", "persistence_image"]:
         parallel_kwargs = {"mmap_mode": "c"}
+        # Subdiagrams may be views of X, but these metrics modify them in
+        # place
+        subdiagrams = {dim: X[:, indices[dim], :2].copy()
+                       for dim in homology_dimensions}
     else:
-        parallel_kwargs = {}
-
-    amplitude_arrays = Parallel(n_jobs=n_jobs, **parallel_kwargs)(
+        # The remaining metrics are vectorized NumPy code releasing the GIL,
+        # so threads avoid the cost of sending subdiagrams to processes
+        parallel_kwargs = {"prefer": "threads"}
+        subdiagrams = {dim: X[:, indices[dim], :2]
+                       for dim in homology_dimensions}
+
+    # When running in parallel, use twice as many slices as jobs to balance
+    # the load between them
+    n_jobs_ = effective_n_jobs(n_jobs)
+    n_slices = 2 * n_jobs_ if n_jobs_ > 1 else 1
+    slices = list(gen_even_slices(_num_samples(X), n_slices))
+    amplitude_blocks = Parallel(n_jobs=n_jobs, **parallel_kwargs)(
         delayed(amplitude_func)(
-            _subdiagrams(X[s], [dim], remove_dim=True),
+            subdiagrams[dim][s],
             sampling=samplings[dim],
             step_size=step_sizes[dim],
             **effective_metric_params
             )
         for dim in homology_dimensions
-        for s in gen_even_slices(_num_samples(X), effective_n_jobs(n_jobs))
+        for s in slices
         )
 
-    amplitude_arrays = np.concatenate(amplitude_arrays).\
-        reshape(len(homology_dimensions), len(X)).T
+    amplitude_arrays = np.empty((len(X), len(homology_dimensions)))
+    amplitude_blocks = iter(amplitude_blocks)
+    for d in range(len(homology_dimensions)):
+        for s in slices:
+            amplitude_arrays[s, d] = next(amplitude_blocks)
 
     return amplitude_arrays
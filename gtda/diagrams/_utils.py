@@ -1,6 +1,8 @@
 """Utility functions for diagrams."""
 # License: GNU AGPLv3
 
+from functools import lru_cache
+
 import numpy as np
 
 
@@ -52,6 +54,45 @@ def _subdiagrams(X, homology_dimensions, remove_dim=False):
     return Xs
 
 
+def _subdiagrams_indices(X, homology_dimensions):
+    """For each homology dimension in a given list, find the indices along
+    axis 1 of the triples in that homology dimension, scanning the homology
+    dimension column of X only once. Indices of contiguous blocks of triples,
+    as produced e.g. by the transformers in :mod:`gtda.homology`, are given as
+    slices so that indexing X with them yields views. If the diagrams in X do
+    not all share the same homology dimension column, a copy of X in which the
+    triples of each diagram are stably sorted by homology dimension is
+    returned in place of X. It is assumed that all diagrams in X contain the
+    same number of points in each homology dimension."""
+    X_0_dims = X[0, :, 2]
+    if not np.all(X[:, :, 2] == X_0_dims):
+        order = np.argsort(X[:, :, 2], axis=1, kind='stable')
+        X = np.take_along_axis(X, order[:, :, None], axis=1)
+        X_0_dims = X[0, :, 2]
+        is_different = X[:, :, 2] != X_0_dims
+        if np.any(is_different):
+            # Sorted dimension columns first differ at the smallest
+            # homology dimension whose number of triples is not constant
+            j = np.flatnonzero(np.any(is_different, axis=0))[0]
+            i = np.flatnonzero(is_different[:, j])[0]
+            homology_dimension = min(X_0_dims[j], X[i, j, 2])
+            raise ValueError(
+                f"All persistence diagrams in the collection must have "
+                f"the same number of birth-death-dimension triples in any "
+                f"given homology dimension. This is not true in homology "
+                f"dimension {homology_dimension}. Trivial triples for "
+                f"which birth = death may be added or removed to fulfill "
+                f"this requirement."
+                )
+    indices = {}
+    for dim in homology_dimensions:
+        idx = np.flatnonzero(X_0_dims == dim)
+        if idx.size and idx[-1] - idx[0] + 1 == idx.size:
+            idx = slice(idx[0], idx[-1] + 1)
+        indices[dim] = idx
+    return X, indices
+
+
 def _sample_image(image, diagram_pixel_coords):
     # WARNING: Modifies `image` in-place
     unique, counts = \
@@ -79,18 +120,14 @@ def _multirange(counts):
 
 def _filter(X, filtered_homology_dimensions, cutoff):
     n = len(X)
-    homology_dimensions = sorted(np.unique(X[0, :, 2]))
+    homology_dimensions = \
+        _homology_dimensions_to_sorted_ints(np.unique(X[0, :, 2]))
     unfiltered_homology_dimensions = [dim for dim in homology_dimensions if
                                       dim not in filtered_homology_dimensions]
 
-    if len(unfiltered_homology_dimensions) == 0:
-        Xuf = np.empty((n, 0, 3), dtype=X.dtype)
-    else:
-        Xuf = _subdiagrams(X, unfiltered_homology_dimensions)
-
     # Compute a global 2D cutoff mask once
     cutoff_mask = X[:, :, 1] - X[:, :, 0] > cutoff
-    Xf = []
+    filtered_triples = []
     for dim in filtered_homology_dimensions:
         # Compute a 2D mask for persistence pairs in dimension dim
         dim_mask = X[:, :, 2] == dim
@@ -98,7 +135,7 @@ def _filter(X, filtered_homology_dimensions, cutoff):
         # dim surviving the cutoff
         indices = np.nonzero(np.logical_and(dim_mask, cutoff_mask))
         if not indices[0].size:
-            Xdim = np.tile([0., 0., dim], (n, 1, 1))
+            filtered_triples.append((None, None, None, 1, 0.))
         else:
             # A unique element k is repeated N times *consecutively* in
             # indices[0] iff there are exactly N valid persistence triples
@@ -108,35 +145,78 @@ def _filter(X, filtered_homology_dimensions, cutoff):
             # Make a global 2D array of all valid triples
             X_indices = X[indices]
             min_value = np.min(X_indices[:, 0])  # For padding
-            # Initialise the array of filtered subdiagrams in dimension m
-            Xdim = np.tile([min_value, min_value, dim], (n, max_n_points, 1))
+            filtered_triples.append(
+                (indices, counts, X_indices, max_n_points, min_value)
+                )
+
+    n_features_filtered = sum(
+        max_n_points for _, _, _, max_n_points, _ in filtered_triples
+        )
+    n_features_unfiltered = np.count_nonzero(
+        np.isin(X[0, :, 2], unfiltered_homology_dimensions)
+        )
+    if unfiltered_homology_dimensions:
+        X, unfiltered_indices = \
+            _subdiagrams_indices(X, unfiltered_homology_dimensions)
+
+    # Write filtered and unfiltered subdiagrams directly into the output
+    Xf = np.empty((n, n_features_filtered + n_features_unfiltered, 3),
+                  dtype=float)
+    start = 0
+    for dim, (indices, counts, X_indices, max_n_points, min_value) in \
+            zip(filtered_homology_dimensions, filtered_triples):
+        end = start + max_n_points
+        # Initialise the filtered subdiagrams in dimension dim with padding
+        Xf[:, start:end] = [min_value, min_value, dim]
+        if indices is not None:
             # Since repeated indices in indices[0] are consecutive and we know
             # the counts per unique index, we can fill the top portion of
-            # each 2D array entry of Xdim with the filtered triples from the
+            # each 2D array entry of Xf with the filtered triples from the
             # corresponding entry of X
-            Xdim[indices[0], _multirange(counts)] = X_indices
-        Xf.append(Xdim)
+            Xf[indices[0], start + _multirange(counts)] = X_indices
+        start = end
+    for dim in unfiltered_homology_dimensions:
+        Xdim = X[:, unfiltered_indices[dim]]
+        end = start + Xdim.shape[1]
+        Xf[:, start:end] = Xdim
+        start = end
 
-    Xf.append(Xuf)
-    Xf = np.concatenate(Xf, axis=1)
     return Xf
 
 
 def _bin(X, metric, n_bins=100, homology_dimensions=None, **kw_args):
     if homology_dimensions is None:
-        homology_dimensions = sorted(np.unique(X[0, :, 2]))
-    # For some vectorizations, we force the values to be the same + widest
-    sub_diags = {dim: _subdiagrams(X, [dim], remove_dim=True)
-                 for dim in homology_dimensions}
-    # For persistence images, move into birth-persistence
-    if metric == 'persistence_image':
-        for dim in homology_dimensions:
-            sub_diags[dim][:, :, [1]] = sub_diags[dim][:, :, [1]] \
-                - sub_diags[dim][:, :, [0]]
-    min_vals = {dim: np.min(sub_diags[dim], axis=(0, 1))
-                for dim in homology_dimensions}
-    max_vals = {dim: np.max(sub_diags[dim], axis=(0, 1))
-                for dim in homology_dimensions}
+        homology_dimensions = \
+            _homology_dimensions_to_sorted_ints(np.unique(X[0, :, 2]))
+    X, indices = _subdiagrams_indices(X, homology_dimensions)
+    extrema = []
+    for dim in homology_dimensions:
+        sub_diag = X[:, indices[dim], :2]
+        # For persistence images, move into birth-persistence
+        if metric == 'persistence_image':
+            sub_diag = np.stack([sub_diag[:, :, 0],
+                                 sub_diag[:, :, 1] - sub_diag[:, :, 0]],
+                                axis=2)
+        extrema.append((tuple(np.min(sub_diag, axis=(0, 1))),
+                        tuple(np.max(sub_diag, axis=(0, 1)))))
+
+    # Sampling grids only depend on the extrema of each subdiagram, so they
+    # are cached and copied to keep cached arrays safe from modification
+    samplings, step_sizes = _bin_from_extrema(
+        metric, n_bins, tuple(homology_dimensions), tuple(extrema)
+        )
+    samplings = {dim: sampling.copy() for dim, sampling in samplings.items()}
+    step_sizes = {dim: step_size.copy()
+                  for dim, step_size in step_sizes.items()}
+    return samplings, step_sizes
+
+
+@lru_cache()
+def _bin_from_extrema(metric, n_bins, homology_dimensions, extrema):
+    min_vals = {dim: np.array(extrema_dim[0])
+                for dim, extrema_dim in zip(homology_dimensions, extrema)}
+    max_vals = {dim: np.array(extrema_dim[1])
+                for dim, extrema_dim in zip(homology_dimensions, extrema)}
 
     if metric in ['landscape', 'betti', 'heat', 'silhouette']:
         #  Taking the min(resp. max) of a tuple `m` amounts to extracting
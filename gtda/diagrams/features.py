@@ -5,18 +5,23 @@ from numbers import Real
 
 import numpy as np
 from joblib import Parallel, delayed, effective_n_jobs
-from scipy.stats import entropy
+from scipy.special import xlogy
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.utils import gen_even_slices
 from sklearn.utils.validation import check_is_fitted
 
 from ._metrics import _AVAILABLE_AMPLITUDE_METRICS, _parallel_amplitude
 from ._features import _AVAILABLE_POLYNOMIALS, _implemented_polynomial_recipes
-from ._utils import _subdiagrams, _bin, _homology_dimensions_to_sorted_ints
+from ._utils import _subdiagrams_indices, _bin, \
+    _homology_dimensions_to_sorted_ints
 from ..utils._docs import adapt_fit_transform_docs
 from ..utils.intervals import Interval
 from ..utils.validation import validate_params, check_diagrams
 
+# Minimum number of triples in a collection of diagrams for the computation of
+# simple features to be split between joblib workers
+_MIN_PARALLEL_SIZE = 100000
+
 
 @adapt_fit_transform_docs
 class PersistenceEntropy(BaseEstimator, TransformerMixin):
@@ -88,15 +93,31 @@ class PersistenceEntropy(BaseEstimator, TransformerMixin):
         self.n_jobs = n_jobs
 
     @staticmethod
-    def _persistence_entropy(X, normalize=False, nan_fill_value=None):
+    def _persistence_entropy(X, indices, normalize=False,
+                             nan_fill_value=None):
+        # Lifetimes are computed once for all homology dimensions, and
+        # `indices` selects the lifetimes of the triples in each of them
         X_lifespan = X[:, :, 1] - X[:, :, 0]
-        X_entropy = entropy(X_lifespan, base=2, axis=1)
+        lifespan_sums = np.empty((len(X), len(indices)))
+        xlogy_sums = np.empty_like(lifespan_sums)
+        for i, idx in enumerate(indices):
+            X_lifespan_dim = X_lifespan[:, idx]
+            lifespan_sums[:, i] = np.sum(X_lifespan_dim, axis=1)
+            xlogy_sums[:, i] = np.sum(xlogy(X_lifespan_dim, X_lifespan_dim),
+                                      axis=1)
+        # Closed form of the entropy of the lifetimes normalized by their sum
+        # S, avoiding the normalized copy: ln(S) - sum(l * ln(l)) / S in
+        # natural units. Conversion to bits is a single final multiplication,
+        # and cancels out when normalizing by log2(S)
+        log_lifespan_sums = np.log(lifespan_sums)
+        X_entropy = xlogy_sums / lifespan_sums
+        np.subtract(log_lifespan_sums, X_entropy, out=X_entropy)
         if normalize:
-            lifespan_sums = np.sum(X_lifespan, axis=1)
-            X_entropy /= np.log2(lifespan_sums)
+            X_entropy /= log_lifespan_sums
+        else:
+            X_entropy *= 1 / np.log(2)
         if nan_fill_value is not None:
             np.nan_to_num(X_entropy, nan=nan_fill_value, copy=False)
-        X_entropy = X_entropy[:, None]
         return X_entropy
 
     def fit(self, X, y=None):
@@ -165,18 +186,32 @@ class PersistenceEntropy(BaseEstimator, TransformerMixin):
         """
         check_is_fitted(self)
         X = check_diagrams(X)
+        X, indices = _subdiagrams_indices(X, self.homology_dimensions_)
+        indices = [indices[dim] for dim in self.homology_dimensions_]
 
+        n_jobs = effective_n_jobs(self.n_jobs)
         with np.errstate(divide='ignore', invalid='ignore'):
-            Xt = Parallel(n_jobs=self.n_jobs)(
-                delayed(self._persistence_entropy)(
-                    _subdiagrams(X[s], [dim]),
+            # Dispatching to joblib only pays off for large enough inputs
+            if n_jobs == 1 or X.shape[0] * X.shape[1] < _MIN_PARALLEL_SIZE:
+                Xt = self._persistence_entropy(
+                    X, indices,
                     normalize=self.normalize,
                     nan_fill_value=self.nan_fill_value
                     )
-                for dim in self.homology_dimensions_
-                for s in gen_even_slices(len(X), effective_n_jobs(self.n_jobs))
-                )
-        Xt = np.concatenate(Xt).reshape(self._n_dimensions, len(X)).T
+            else:
+                # Twice as many slices as jobs, to balance the load
+                slices = list(gen_even_slices(len(X), 2 * n_jobs))
+                Xt_slices = Parallel(n_jobs=self.n_jobs, prefer='threads')(
+                    delayed(self._persistence_entropy)(
+                        X[s], indices,
+                        normalize=self.normalize,
+                        nan_fill_value=self.nan_fill_value
+                        )
+                    for s in slices
+                    )
+                Xt = np.empty((len(X), self._n_dimensions))
+                for s, Xt_slice in zip(slices, Xt_slices):
+                    Xt[s] = Xt_slice
 
         return Xt
 
@@ -380,9 +415,9 @@ class Amplitude(BaseEstimator, TransformerMixin):
 
         """
         check_is_fitted(self)
-        Xt = check_diagrams(X, copy=True)
+        X = check_diagrams(X)
 
-        Xt = _parallel_amplitude(Xt, self.metric,
+        Xt = _parallel_amplitude(X, self.metric,
                                  self.effective_metric_params_,
                                  self.homology_dimensions_,
                                  self.n_jobs)
@@ -498,13 +533,19 @@ class NumberOfPoints(BaseEstimator, TransformerMixin):
         """
         check_is_fitted(self)
         X = check_diagrams(X)
+        X, indices = _subdiagrams_indices(X, self.homology_dimensions_)
 
-        Xt = Parallel(n_jobs=self.n_jobs)(
-            delayed(self._number_points)(_subdiagrams(X, [dim])[s])
+        slices = list(gen_even_slices(len(X), effective_n_jobs(self.n_jobs)))
+        Xt_blocks = Parallel(n_jobs=self.n_jobs, prefer='threads')(
+            delayed(self._number_points)(X[s, indices[dim], :2])
             for dim in self.homology_dimensions_
-            for s in gen_even_slices(len(X), effective_n_jobs(self.n_jobs))
+            for s in slices
             )
-        Xt = np.concatenate(Xt).reshape(self._n_dimensions, len(X)).T
+        Xt = np.empty((len(X), self._n_dimensions), dtype=int)
+        Xt_blocks = iter(Xt_blocks)
+        for d in range(self._n_dimensions):
+            for s in slices:
+                Xt[s, d] = next(Xt_blocks)
 
         return Xt
 
@@ -662,17 +703,19 @@ class ComplexPolynomial(BaseEstimator, TransformerMixin):
         return self
 
     def _complex_polynomial(self, X, n_coefficients):
-        Xt = np.zeros(2 * n_coefficients,)
-        X = X[X[:, 0] != X[:, 1]]
+        Xt = np.zeros((len(X), 2 * n_coefficients))
+        is_nontrivial = X[:, :, 0] != X[:, :, 1]
+        for i, diagram in enumerate(X):
+            diagram = diagram[is_nontrivial[i]]
 
-        roots = self._polynomial_function(X)
-        coefficients = np.poly(roots)
+            roots = self._polynomial_function(diagram)
+            coefficients = np.poly(roots)
 
-        coefficients = np.array(coefficients[1:])
-        dimension = min(n_coefficients, coefficients.shape[0])
-        Xt[:dimension] = coefficients[:dimension].real
-        Xt[n_coefficients:n_coefficients + dimension] = \
-            coefficients[:dimension].imag
+            coefficients = np.array(coefficients[1:])
+            dimension = min(n_coefficients, coefficients.shape[0])
+            Xt[i, :dimension] = coefficients[:dimension].real
+            Xt[i, n_coefficients:n_coefficients + dimension] = \
+                coefficients[:dimension].imag
 
         return Xt
 
@@ -704,15 +747,25 @@ class ComplexPolynomial(BaseEstimator, TransformerMixin):
 
         """
         check_is_fitted(self)
-        Xt = check_diagrams(X, copy=True)
+        X = check_diagrams(X)
+        X, indices = _subdiagrams_indices(X, self.homology_dimensions_)
 
-        Xt = Parallel(n_jobs=self.n_jobs)(
+        # One task per homology dimension and per slice of samples, each
+        # processing a whole block of subdiagrams
+        slices = list(gen_even_slices(len(X), effective_n_jobs(self.n_jobs)))
+        Xt_blocks = Parallel(n_jobs=self.n_jobs)(
             delayed(self._complex_polynomial)(
-                _subdiagrams(Xt[[s]], [dim], remove_dim=True)[0],
-                self.n_coefficients_[d])
-            for s in range(len(X))
+                X[s, indices[dim], :2], self.n_coefficients_[d])
             for d, dim in enumerate(self.homology_dimensions_)
+            for s in slices
             )
-        Xt = np.concatenate(Xt).reshape(len(X), -1)
+        Xt = np.empty((len(X), 2 * sum(self.n_coefficients_)))
+        Xt_blocks = iter(Xt_blocks)
+        start = 0
+        for n_coefficients in self.n_coefficients_:
+            end = start + 2 * n_coefficients
+            for s in slices:
+                Xt[s, start:end] = next(Xt_blocks)
+            start = end
 
         return Xt
@@ -14,8 +14,8 @@ from sklearn.utils.validation import check_is_fitted
 
 from ._metrics import betti_curves, landscapes, heats, \
     persistence_images, silhouettes
-from ._utils import _subdiagrams, _bin, _make_homology_dimensions_mapping, \
-    _homology_dimensions_to_sorted_ints
+from ._utils import _subdiagrams_indices, _bin, \
+    _make_homology_dimensions_mapping, _homology_dimensions_to_sorted_ints
 from ..base import PlotterMixin
 from ..plotting import plot_heatmap
 from ..utils._docs import adapt_fit_transform_docs
@@ -157,9 +157,10 @@ class BettiCurve(BaseEstimator, TransformerMixin, PlotterMixin):
         """
         check_is_fitted(self)
         X = check_diagrams(X)
+        X, indices = _subdiagrams_indices(X, self.homology_dimensions_)
 
         Xt = Parallel(n_jobs=self.n_jobs)(delayed(betti_curves)(
-                _subdiagrams(X[s], [dim], remove_dim=True),
+                X[s, indices[dim], :2],
                 self._samplings[dim])
             for dim in self.homology_dimensions_
             for s in gen_even_slices(len(X), effective_n_jobs(self.n_jobs)))
@@ -393,9 +394,10 @@ class PersistenceLandscape(BaseEstimator, TransformerMixin, PlotterMixin):
         """
         check_is_fitted(self)
         X = check_diagrams(X)
+        X, indices = _subdiagrams_indices(X, self.homology_dimensions_)
 
         Xt = Parallel(n_jobs=self.n_jobs)(
-            delayed(landscapes)(_subdiagrams(X[s], [dim], remove_dim=True),
+            delayed(landscapes)(X[s, indices[dim], :2],
                                 self._samplings[dim],
                                 self.n_layers)
             for dim in self.homology_dimensions_
@@ -662,9 +664,10 @@ class HeatKernel(BaseEstimator, TransformerMixin, PlotterMixin):
         """
         check_is_fitted(self)
         X = check_diagrams(X, copy=True)
+        X, indices = _subdiagrams_indices(X, self.homology_dimensions_)
 
         Xt = Parallel(n_jobs=self.n_jobs, mmap_mode="c")(delayed(
-            heats)(_subdiagrams(X[s], [dim], remove_dim=True),
+            heats)(X[s, indices[dim], :2],
                    self._samplings[dim], self._step_size[dim], self.sigma)
             for dim in self.homology_dimensions_
             for s in gen_even_slices(len(X), effective_n_jobs(self.n_jobs)))
@@ -909,10 +912,11 @@ class PersistenceImage(BaseEstimator, TransformerMixin, PlotterMixin):
         """
         check_is_fitted(self)
         X = check_diagrams(X, copy=True)
+        X, indices = _subdiagrams_indices(X, self.homology_dimensions_)
 
         Xt = Parallel(n_jobs=self.n_jobs, mmap_mode="c")(
             delayed(persistence_images)(
-                _subdiagrams(X[s], [dim], remove_dim=True),
+                X[s, indices[dim], :2],
                 self._samplings[dim],
                 self._step_size[dim],
                 self.sigma,
@@ -1133,9 +1137,10 @@ class Silhouette(BaseEstimator, TransformerMixin, PlotterMixin):
         """
         check_is_fitted(self)
         X = check_diagrams(X)
+        X, indices = _subdiagrams_indices(X, self.homology_dimensions_)
 
         Xt = (Parallel(n_jobs=self.n_jobs)
-              (delayed(silhouettes)(_subdiagrams(X[s], [dim], remove_dim=True),
+              (delayed(silhouettes)(X[s, indices[dim], :2],
                                     self._samplings[dim], power=self.power)
               for dim in self.homology_dimensions_
               for s in gen_even_slices(len(X), effective_n_jobs(self.n_jobs))))
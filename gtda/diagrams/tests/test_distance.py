@@ -313,6 +313,14 @@ def test_da_transform(metric, metric_params, order, n_jobs):
     assert X_res.shape == (X2.shape[0], n_expected_columns)
 
 
+@pytest.mark.parametrize(('metric', 'metric_params'), parameters_amplitude)
+def test_da_transform_does_not_modify_input(metric, metric_params):
+    X2_copy = X2.copy()
+    da = Amplitude(metric=metric, metric_params=metric_params)
+    da.fit(X1).transform(X2_copy)
+    assert np.array_equal(X2_copy, X2)
+
+
 @pytest.mark.parametrize(('metric', 'metric_params', 'order'),
                          [('bottleneck', None, None)])
 @pytest.mark.parametrize('n_jobs', [1, 2, -1])
@@ -85,6 +85,24 @@ def test_pe_transform(n_jobs):
     assert_almost_equal(pe_normalize.fit_transform(X), diagram_res)
 
 
+def test_pe_transform_unaligned_hom_dims():
+    X_unaligned = np.concatenate([X, X[:, ::-1]])
+    pe = PersistenceEntropy()
+    diagram_res = np.array([[1., 0.91829583405], [1., 0.91829583405]])
+
+    assert_almost_equal(pe.fit_transform(X_unaligned), diagram_res)
+
+
+def test_pe_transform_large_parallel():
+    """Test that PersistenceEntropy gives the same result when the input is
+    large enough for the computation to be split between jobs"""
+    X_large = np.tile(X, (25000, 1, 1))
+    pe = PersistenceEntropy(n_jobs=2)
+    diagram_res = np.tile([[1., 0.91829583405]], (25000, 1))
+
+    assert_almost_equal(pe.fit_transform(X_large), diagram_res)
+
+
 @pytest.mark.parametrize('n_jobs', [1, 2, -1])
 def test_nop_transform(n_jobs):
     nop = NumberOfPoints(n_jobs=n_jobs)